@@ -1,3 +1,6 @@
+import hashlib
+import json
+import logging
 import os
 
 import discord
@@ -5,16 +8,29 @@ from discord import app_commands
 from discord.ext import commands
 from dotenv import load_dotenv
 
+from utils import local_translator
 from utils.config_manager import ConfigManager
 from utils.queue_manager import TranslationQueueManager
 
 # Load environment variables from .env file
 load_dotenv()
 
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Load the optional local model now that .env and logging are set up
+local_translator.load_model()
+
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 CONFIG_FILE = os.getenv(
     "CONFIG_FILE", "config.json"
 )  # Default to config.json if not set
+COMMAND_HASH_FILE = os.getenv(
+    "COMMAND_HASH_FILE", ".command_tree_hash"
+)  # Hash of the last command tree synced with Discord
 
 intents = discord.Intents.default()
 intents.message_content = True
@@ -57,8 +73,8 @@ async def queuestatus(interaction):
         )
         return
 
-    queue_size = queue_manager.translation_queue.qsize()
-    worker_status = "Running" if queue_manager.worker_running else "Stopped"
+    queue_size = queue_manager.get_queue_size()
+    worker_status = "Running" if queue_manager.is_worker_running() else "Stopped"
 
     embed = discord.Embed(
         title="Translation Queue Status", color=interaction.user.color
@@ -70,13 +86,13 @@ async def queuestatus(interaction):
     embed.add_field(name="Worker Status", value=worker_status, inline=True)
     embed.add_field(
         name="Rate Limit",
-        value=f"{queue_manager.rate_limit_delay}s between translations",
+        value=f"{queue_manager.rate_limit_delay}s between batches per channel",
         inline=True,
     )
 
-    # Calculate approximate wait time
+    # Calculate approximate wait time from the number of batches in the busiest channel
     if queue_size > 0 and queue_manager.rate_limit_delay > 0:
-        wait_time = queue_size * queue_manager.rate_limit_delay
+        wait_time = queue_manager.estimate_wait_time()
         embed.add_field(
             name="Approx. Wait Time", value=f"{wait_time:.1f} seconds", inline=False
         )
@@ -112,7 +128,8 @@ async def queuerate(interaction, delay: float = 1.0):
 
     queue_manager.set_rate_limit(delay)
     await interaction.response.send_message(
-        f"Rate limit set to {delay}s between translations", ephemeral=True
+        f"Rate limit set to {delay}s between translation batches per channel",
+        ephemeral=True,
     )
 
 
@@ -129,8 +146,7 @@ async def queueclear(interaction):
         )
         return
 
-    queue_size = queue_manager.get_queue_size()
-    queue_manager.clear_queue()
+    queue_size = queue_manager.clear_queue()
     await interaction.response.send_message(
         f"Cleared {queue_size} pending translations", ephemeral=True
     )
@@ -198,6 +214,10 @@ async def on_message(message):
     if message.content.startswith("/"):
         return
 
+    # Skip channels that aren't a translation source in any guild
+    if message.channel.id not in config_manager.source_channel_ids:
+        return
+
     # Get guild configuration
     guild_cfg = config_manager.get_guild_config(message.guild.id)
     if not guild_cfg or not guild_cfg.get("enabled", False):
@@ -207,8 +227,10 @@ async def on_message(message):
     if message.channel.id != guild_cfg["source"]:
         return
 
-    print(
-        f"Adding message from {message.author.display_name} to translation queue: '{message.content[:50]}...'"
+    logger.debug(
+        "Adding message from %s to translation queue: '%.50s...'",
+        message.author.display_name,
+        message.content,
     )
 
     # Add message to the translation queue
@@ -218,6 +240,42 @@ async def on_message(message):
     await bot.process_commands(message)
 
 
+@bot.event
+async def on_message_edit(before, after):
+    """Update messages that are edited while still waiting to be queued"""
+    if queue_manager:
+        queue_manager.update_message(after)
+
+
+def command_tree_hash():
+    """Hash the full payload Discord receives for all application commands"""
+    # to_dict() covers everything a sync sends, including choices, permissions and
+    # localisations, so any change to them triggers a sync
+    commands_data = sorted(
+        json.dumps(command.to_dict(bot.tree), sort_keys=True)
+        for command in bot.tree.get_commands()
+    )
+    return hashlib.sha256(json.dumps(commands_data).encode()).hexdigest()
+
+
+def load_command_tree_hash():
+    """Load the hash of the last synced command tree"""
+    try:
+        with open(COMMAND_HASH_FILE, "r") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def save_command_tree_hash(tree_hash):
+    """Save the hash of the synced command tree"""
+    try:
+        with open(COMMAND_HASH_FILE, "w") as f:
+            f.write(tree_hash)
+    except OSError as e:
+        logger.error("Error saving command tree hash: %s", e)
+
+
 @bot.event
 async def on_ready():
     """Initialize bot when ready"""
@@ -226,23 +284,26 @@ async def on_ready():
     await bot.change_presence(activity=activity)
 
     if bot.user:
-        print(f"Bot logged in as {bot.user.name}")
-
-    guild = discord.Object(id=1255655420509294642)
-
-    # Delete ALL guild commands
-    bot.tree.clear_commands(guild=guild)
-    print("Guild commands CLEARED")
-
-    await bot.tree.sync()  # Sync commands with Discord
+        logger.info("Bot logged in as %s", bot.user.name)
+
+    # Syncing is heavily rate limited, so only sync when the commands changed
+    tree_hash = command_tree_hash()
+    if tree_hash != load_command_tree_hash():
+        await bot.tree.sync()  # Sync commands with Discord
+        save_command_tree_hash(tree_hash)
+        logger.info("Synced application commands with Discord")
+    else:
+        logger.info("Application commands unchanged, skipping sync")
 
     # Initialize and start the translation queue manager
+    # on_ready also fires after reconnects, so keep the existing queues
     global queue_manager
-    queue_manager = TranslationQueueManager(bot, CONFIG_FILE)
-    queue_manager.start()
+    if queue_manager is None:
+        queue_manager = TranslationQueueManager(bot, CONFIG_FILE)
+        queue_manager.start()
 
 
 if not DISCORD_TOKEN:
     raise RuntimeError("DISCORD_TOKEN is not set")
 
-bot.run(DISCORD_TOKEN)
+bot.run(DISCORD_TOKEN, log_handler=None)  # Logging is configured above
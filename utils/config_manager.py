@@ -1,38 +1,76 @@
-import json
+import logging
+import os
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+def save_json(file_path, data):
+    """Atomically write data to a JSON file
+
+    The data is written to a temporary file first and then moved into place,
+    so a crash mid-write can't leave a truncated config behind.
+    """
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, file_path)
 
 
 class ConfigManager:
     def __init__(self, config_file_path):
         self.config_file_path = config_file_path
         self.config = self.load_config()
+        self._index_guilds()
 
     def load_config(self):
         """Load configuration from JSON file"""
         try:
-            with open(self.config_file_path, "r") as f:
-                return json.load(f)
+            with open(self.config_file_path, "rb") as f:
+                return orjson.loads(f.read())
         except FileNotFoundError:
             return {}
-        except json.JSONDecodeError:
-            print(f"Error decoding JSON from {self.config_file_path}")
+        except orjson.JSONDecodeError:
+            logger.error("Error decoding JSON from %s", self.config_file_path)
             return {}
 
     def save_config(self):
         """Save configuration to JSON file"""
-        with open(self.config_file_path, "w") as f:
-            json.dump(self.config, f, indent=2)
+        save_json(self.config_file_path, self.config)
+
+    def _index_guilds(self):
+        """Rebuild the lookups used on every incoming message"""
+        # Guild ids are the numeric keys; others such as queueSettings are skipped
+        self._config_by_int = {
+            int(key): value for key, value in self.config.items() if key.isdigit()
+        }
+
+        # Source channels of enabled guilds, so other channels can be ignored early
+        self.source_channel_ids = frozenset(
+            guild_cfg["source"]
+            for guild_cfg in self._config_by_int.values()
+            if guild_cfg.get("enabled", False)
+        )
 
     def get_guild_config(self, guild_id):
-        """Get configuration for a specific guild"""
-        return self.config.get(str(guild_id))
+        """Get configuration for a specific guild by its integer id"""
+        return self._config_by_int.get(guild_id)
 
     def set_guild_config(
         self, guild_id, source_channel_id, target_channel_id, enabled=True
     ):
         """Set configuration for a specific guild"""
-        self.config[str(guild_id)] = {
+        guild_cfg = {
             "source": source_channel_id,
             "target": target_channel_id,
             "enabled": enabled,
         }
+
+        # Only rewrite the file when something actually changed
+        if self.config.get(str(guild_id)) == guild_cfg:
+            return
+
+        self.config[str(guild_id)] = guild_cfg
+        self._index_guilds()
         self.save_config()
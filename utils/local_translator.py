@@ -0,0 +1,100 @@
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# The LOCAL_MODEL_PATH environment variable is the directory of an NLLB-200 model
+# converted for CTranslate2 with int8 quantization, e.g.
+#   ct2-transformers-converter --model facebook/nllb-200-distilled-600M \
+#       --quantization int8 --output_dir nllb-200-distilled-600M-int8
+# with the model's sentencepiece.bpe.model copied into the same directory
+# It is read by load_model(), after bot.py has loaded .env
+
+# Detected language codes the local model handles, mapped to NLLB language codes
+NLLB_LANGUAGES = {
+    "de": "deu_Latn",
+    "pt": "por_Latn",
+    "es": "spa_Latn",
+    "fr": "fra_Latn",
+}
+
+
+# Set by load_model(), which only runs once
+_translator = None
+_tokenizer = None
+_loaded = False
+
+
+def load_model():
+    """
+    Load the local model and tokenizer if LOCAL_MODEL_PATH is set
+
+    Call this after the environment and logging are set up. Later calls do nothing
+    """
+    global _translator, _tokenizer, _loaded
+    if _loaded:
+        return
+    _loaded = True
+    _translator, _tokenizer = _load_model(os.getenv("LOCAL_MODEL_PATH"))
+
+
+def _load_model(model_path):
+    """Load the model and tokenizer from model_path, or return (None, None)"""
+    if not model_path:
+        return None, None
+
+    try:
+        import ctranslate2
+        import sentencepiece
+    except ImportError:
+        logger.warning(
+            "LOCAL_MODEL_PATH is set but ctranslate2/sentencepiece are not installed, "
+            "local translation disabled"
+        )
+        return None, None
+
+    try:
+        translator = ctranslate2.Translator(
+            model_path, device="cpu", compute_type="int8"
+        )
+        tokenizer = sentencepiece.SentencePieceProcessor(
+            model_file=os.path.join(model_path, "sentencepiece.bpe.model")
+        )
+    except Exception as e:
+        logger.error("Error loading local translation model: %s", e)
+        return None, None
+
+    logger.info("Loaded local translation model from %s", model_path)
+    return translator, tokenizer
+
+
+def supports(lang):
+    """Check if the local model is loaded and can translate from lang"""
+    # Normally already loaded at startup, this only loads it if that was skipped
+    load_model()
+    return _translator is not None and lang in NLLB_LANGUAGES
+
+
+def translate(text, source_lang):
+    """
+    Translates text to English with the local NLLB model
+
+    This blocks while the model runs, so call it from a worker thread
+
+    Args:
+        text (str): Text to translate
+        source_lang (str): Detected language code, one of NLLB_LANGUAGES
+
+    Returns:
+        str: Translated text
+    """
+    source = (
+        [NLLB_LANGUAGES[source_lang]] + _tokenizer.encode(text, out_type=str) + ["</s>"]
+    )
+    results = _translator.translate_batch(
+        [source], target_prefix=[["eng_Latn"]], beam_size=2, max_decoding_length=128
+    )
+
+    # Drop the leading target language token
+    tokens = results[0].hypotheses[0][1:]
+    return _tokenizer.decode(tokens).strip()
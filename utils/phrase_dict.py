@@ -0,0 +1,121 @@
+# Common short chat phrases mapped to their English translations
+# Keys are lowercase without trailing ".!?" so they match text.lower().strip().rstrip(".!?")
+# Only phrases that are unambiguous and not also English words belong here
+COMMON_PHRASES = {
+    # Portuguese
+    "obrigado": "thank you",
+    "obrigada": "thank you",
+    "muito obrigado": "thank you very much",
+    "muito obrigada": "thank you very much",
+    "valeu": "thanks",
+    "vlw": "thanks",
+    "de nada": "you're welcome",
+    "por favor": "please",
+    "bom dia": "good morning",
+    "boa tarde": "good afternoon",
+    "boa noite": "good night",
+    "oi": "hi",
+    "olá": "hello",
+    "ola": "hello",
+    "tchau": "bye",
+    "até logo": "see you later",
+    "ate logo": "see you later",
+    "até mais": "see you later",
+    "ate mais": "see you later",
+    "até amanhã": "see you tomorrow",
+    "ate amanha": "see you tomorrow",
+    "tudo bem": "all good",
+    "tudo bom": "all good",
+    "beleza": "cool",
+    "sim": "yes",
+    "não": "no",
+    "nao": "no",
+    "claro": "of course",
+    "com certeza": "definitely",
+    "bom jogo": "good game",
+    "boa sorte": "good luck",
+    "parabéns": "congratulations",
+    "parabens": "congratulations",
+    "desculpa": "sorry",
+    "desculpe": "sorry",
+    "foi mal": "my bad",
+    "bora": "let's go",
+    "vamos": "let's go",
+    "eu também": "me too",
+    "eu tambem": "me too",
+    "entendi": "got it",
+    "calma": "calm down",
+    "ótimo": "great",
+    "otimo": "great",
+    "que legal": "how cool",
+    "meu deus": "oh my god",
+    "nossa": "wow",
+    "bem-vindo": "welcome",
+    "bem-vinda": "welcome",
+    "bem vindo": "welcome",
+    "bem vinda": "welcome",
+    # German and Swiss German
+    "danke": "thanks",
+    "danke schön": "thank you very much",
+    "dankeschön": "thank you very much",
+    "danke vielmals": "thank you very much",
+    "merci vielmal": "thank you very much",
+    "merci vilmal": "thank you very much",
+    "bitte schön": "you're welcome",
+    "gern geschehen": "you're welcome",
+    "guten morgen": "good morning",
+    "guete morge": "good morning",
+    "gueten morge": "good morning",
+    "guten tag": "good day",
+    "guten abend": "good evening",
+    "guete abig": "good evening",
+    "gute nacht": "good night",
+    "guet nacht": "good night",
+    "gueti nacht": "good night",
+    "hallo": "hello",
+    "hoi": "hi",
+    "hoi zäme": "hi everyone",
+    "hoi zame": "hi everyone",
+    "sali": "hi",
+    "salü": "hi",
+    "grüezi": "hello",
+    "gruezi": "hello",
+    "grüessech": "hello",
+    "tschüss": "bye",
+    "tschüs": "bye",
+    "uf widerluege": "goodbye",
+    "uf wiederluege": "goodbye",
+    "bis morgen": "see you tomorrow",
+    "bis morn": "see you tomorrow",
+    "bis später": "see you later",
+    "bis spöter": "see you later",
+    "nein": "no",
+    "nei": "no",
+    "genau": "exactly",
+    "stimmt": "that's right",
+    "entschuldigung": "sorry",
+    "tschuldigung": "sorry",
+    "alles gut": "all good",
+    "alles klar": "got it",
+    "wie gehts": "how are you",
+    "wie geht's": "how are you",
+    "wie gahts": "how are you",
+    "wie gaht's": "how are you",
+    "gäll": "right",
+    "gell": "right",
+    "en guete": "enjoy your meal",
+    "e guete": "enjoy your meal",
+    "guten appetit": "enjoy your meal",
+    "viel glück": "good luck",
+    "vill glück": "good luck",
+    "gute besserung": "get well soon",
+    "gueti besserig": "get well soon",
+    "herzlichen glückwunsch": "congratulations",
+    "gratuliere": "congratulations",
+    "schönes wochenende": "have a nice weekend",
+    "schöns wucheend": "have a nice weekend",
+    "keine ahnung": "no idea",
+    "kei ahnig": "no idea",
+    "ich auch": "me too",
+    "ich au": "me too",
+}
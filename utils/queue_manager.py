@@ -1,229 +1,445 @@
 import asyncio
-import json
-import threading
+import logging
 import time
-from queue import Empty, Queue
 
 import discord
+import orjson
 
-from .translator import translate_message_with_links
+from .config_manager import save_json
+from .translator import translate_messages
+
+logger = logging.getLogger(__name__)
+
+# Limits for coalescing queued messages into one translation request
+BATCH_MAX_MESSAGES = 8
+BATCH_MAX_CHARS = 2000
+
+# How long to wait for follow-up messages from the same author before translating
+DEBOUNCE_DELAY = 0.5  # seconds
+# Follow-ups stop extending the wait this long after the author's first message
+DEBOUNCE_MAX_HOLD = 2.0  # seconds
 
 
 class TranslationQueueManager:
-    """Manages a queue of translation jobs to ensure messages are processed in order.
+    """Manages translation queues to ensure messages are processed in order.
 
-    Key feature: Sequential processing guarantees message order regardless of API response times.
+    Key feature: Each source channel has its own queue and worker, so sequential
+    processing guarantees message order within a channel while a slow translation
+    in one channel doesn't hold up the others.
+    The queues and workers run on the bot's event loop, so all methods must be called from it.
     """
 
     def __init__(self, bot, config_file="config.json"):
         self.bot = bot
-        self.translation_queue = Queue()
-        self.worker_running = False
-        self.worker_thread = None
+        # Set while the queue is running; workers wait on it while paused
+        self._run_event = asyncio.Event()
+        self._channel_queues = {}  # source channel id -> asyncio.Queue
+        self._channel_workers = {}  # source channel id -> worker task
+        self._held_jobs = {}  # source channel id -> job taken just before a pause
+        # (channel id, author id) -> (timer handle, job) still held open for debouncing
+        self._pending = {}
         self.config_file = config_file
         self.rate_limit_delay = self._load_config().get(
             "rateLimitDelay", 1.0
         )  # Default 1.0s delay
 
     class MessageJob:
-        """Represents a translation job for a message"""
+        """Represents a translation job for one or more consecutive messages from one author
+
+        The job is queued on the author's first message so it keeps that place in the
+        channel's order. Follow-up messages are added until the job is closed.
+        """
 
         def __init__(self, message, guild_cfg):
             self.message = message
+            self.messages = [message]
             self.guild_cfg = guild_cfg
+            self.text = None  # Set when the job is closed
+            self.cancelled = False
+            # Set once no more messages will be added
+            self.ready = asyncio.Event()
             self.timestamp = time.time()
+            self.held_since = time.monotonic()
+
+        def length(self):
+            """Get the length of the combined text so far"""
+            return sum(len(m.content) for m in self.messages) + len(self.messages) - 1
+
+        def close(self):
+            """Stop adding messages and combine them into the job's text"""
+            self.message = self.messages[0]
+            self.text = "\n".join(m.content for m in self.messages)
+            self.ready.set()
 
     def add_message(self, message, guild_cfg):
-        """Add a message to the translation queue"""
-        job = self.MessageJob(message, guild_cfg)
-        self.translation_queue.put(job)
-
-        # Start worker thread if not already running
-        if not self.worker_running or (
-            self.worker_thread and not self.worker_thread.is_alive()
-        ):
-            self.worker_thread = threading.Thread(
-                target=self._process_queue, daemon=True
-            )
-            self.worker_thread.start()
+        """Add a message to its channel's translation queue
 
-        return job
+        The message is queued straight away but held open for DEBOUNCE_DELAY seconds,
+        so follow-up messages from the same author are combined into the same job.
+        The hold ends early once the combined text reaches BATCH_MAX_CHARS or
+        DEBOUNCE_MAX_HOLD seconds after the first message.
+        """
+        key = (message.channel.id, message.author.id)
+        pending = self._pending.get(key)
+        if pending:
+            _, job = pending
+            if job.length() + 1 + len(message.content) <= BATCH_MAX_CHARS:
+                job.messages.append(message)
+                self._schedule_flush(key, job)
+                return
+
+            # Too long to combine, so close the held job and start a new one
+            self._flush_pending(key)
 
-    def _process_queue(self):
-        """Worker thread function to process messages from the queue in order.
+        job = self.MessageJob(message, guild_cfg)
+        self._enqueue(job)
+        self._schedule_flush(key, job)
 
-        CRITICAL: This ensures message order by processing messages sequentially.
-        Each message is fully processed (translation + Discord post) before
-        the next message is started, regardless of API response time.
+    def update_message(self, message):
+        """Replace a message that was edited while still held for debouncing
+
+        Returns:
+            bool: True if the message was pending and has been replaced
+        """
+        key = (message.channel.id, message.author.id)
+        pending = self._pending.get(key)
+        if not pending:
+            return False
+
+        _, job = pending
+        for i, pending_message in enumerate(job.messages):
+            if pending_message.id == message.id:
+                job.messages[i] = message
+                self._schedule_flush(key, job)
+                return True
+
+        return False
+
+    def _schedule_flush(self, key, job):
+        """Restart the debounce timer for a held job, within its size and time limits"""
+        pending = self._pending.get(key)
+        if pending:
+            pending[0].cancel()
+
+        delay = min(
+            DEBOUNCE_DELAY, job.held_since + DEBOUNCE_MAX_HOLD - time.monotonic()
+        )
+        timer = self.bot.loop.call_later(max(delay, 0), self._flush_pending, key)
+        self._pending[key] = (timer, job)
+
+        if job.length() >= BATCH_MAX_CHARS:
+            self._flush_pending(key)
+
+    def _flush_pending(self, key):
+        """Close an author's held job so its worker can translate it"""
+        timer, job = self._pending.pop(key)
+        timer.cancel()
+        job.close()
+
+    def _enqueue(self, job):
+        """Put a job on its channel's queue"""
+        channel_id = job.message.channel.id
+        queue = self._channel_queues.get(channel_id)
+        if queue is None:
+            queue = self._channel_queues[channel_id] = asyncio.Queue()
+        queue.put_nowait(job)
+
+        # Start the channel's worker lazily on its first message
+        self._start_channel_worker(channel_id)
+
+    async def _process_channel(self, channel_id):
+        """Worker task to process messages from one channel's queue in order.
+
+        CRITICAL: This ensures message order by processing batches sequentially.
+        Waiting messages are taken off the queue in batches of up to
+        BATCH_MAX_MESSAGES, translated together, and posted in queue order before
+        the next batch is started, regardless of API response time. The rate
+        limit delay applies once per batch.
         """
-        self.worker_running = True
+        queue = self._channel_queues[channel_id]
+        next_batch_at = 0.0
 
-        print("Translation queue worker started")
+        logger.info("Translation queue worker started for channel %s", channel_id)
 
-        while self.worker_running:
-            try:
-                # Get a job from the queue with timeout
+        try:
+            while True:
+                # Wait for the next job
                 # FIFO queue ensures messages are processed in order of receipt
-                job = self.translation_queue.get(timeout=1.0)
-
-                # Process the translation
-                # NOTE: This blocks until complete, ensuring order is maintained
-                print(
-                    f"Processing message from {job.message.author.display_name}: '{job.message.content[:50]}...'"
-                )
-
-                # Translate the message (handling links properly)
-                translated = translate_message_with_links(
-                    job.message.content, target="en"
-                )
-
-                # Skip if no translation is needed (English message, link-only, or other reason)
-                if translated is None:
-                    print("Skipping message - no translation needed")
-                    self.translation_queue.task_done()
+                await self._run_event.wait()
+                job = await queue.get()
+
+                # The queue may have been paused while waiting for the job
+                # Hold it where get_queue_size() and clear_queue() can still see it
+                if not self._run_event.is_set():
+                    self._held_jobs[channel_id] = job
+                    await self._run_event.wait()
+                    if channel_id not in self._held_jobs:
+                        # Dropped by clear_queue() while paused
+                        continue
+                    job = self._held_jobs.pop(channel_id)
+
+                # Wait for the job to get its follow-up messages
+                await job.ready.wait()
+                if job.cancelled:
+                    # Dropped by clear_queue() while held for debouncing
+                    queue.task_done()
                     continue
 
-                print(f"Translated message: '{translated[:50]}...'")
-
-                # Create an embed with user avatar, name, timestamp and translated message
-                embed = discord.Embed(
-                    description=translated,
-                    color=job.message.author.color,
-                    timestamp=job.message.created_at,
-                )
-                embed.set_author(
-                    name=job.message.author.display_name,
-                    icon_url=job.message.author.display_avatar.url
-                    if job.message.author.display_avatar
-                    else None,
-                )
-
-                embed.add_field(
-                    name="",
-                    value=f"[Jump to original message]({job.message.jump_url})",
-                    inline=False,
-                )
-
-                # Send to target channel
-                target_channel = self.bot.get_channel(job.guild_cfg["target"])
-                if target_channel:
-                    # Use asyncio to send message from this thread to Discord
-                    asyncio.run_coroutine_threadsafe(
-                        target_channel.send(embed=embed), self.bot.loop
-                    )
-                else:
-                    print(
-                        f"Could not find target channel with ID: {job.guild_cfg['target']}"
-                    )
+                # Apply rate limiting between API calls for this channel
+                # Time spent waiting for new messages counts towards the delay
+                # It does not affect the ordering guarantee
+                wait_time = next_batch_at - time.monotonic()
+                if wait_time > 0:
+                    await asyncio.sleep(wait_time)
 
-                # Mark job as done
-                self.translation_queue.task_done()
+                # Coalesce other waiting messages into the same translation request
+                # Collected after the delay so messages that arrived during it are included
+                jobs = self._collect_batch(queue, job)
 
-                # Apply rate limiting between API calls
-                # This delay happens AFTER each message is completely processed
-                # It does not affect the ordering guarantee
-                time.sleep(self.rate_limit_delay)
-
-            except Empty:
-                # No items in queue, continue loop
-                continue
-            except Exception as e:
-                print(f"Error in translation queue worker: {e}")
-                # Mark job as done even if there was an error
                 try:
-                    self.translation_queue.task_done()
-                except Exception:
-                    pass
+                    # The last job in the batch may still be held for follow-ups
+                    await jobs[-1].ready.wait()
+
+                    # Jobs dropped by clear_queue() while they were held
+                    active = [job for job in jobs if not job.cancelled]
+                    if not active:
+                        continue
+
+                    for job in active:
+                        logger.debug(
+                            "Processing message from %s: '%.50s...'",
+                            job.message.author.display_name,
+                            job.text,
+                        )
+
+                    # Translate the messages (handling links properly)
+                    translations = await translate_messages(
+                        [
+                            (
+                                job.text,
+                                job.message.guild.id,
+                                job.message.author.id,
+                            )
+                            for job in active
+                        ],
+                        "en",
+                    )
+                    next_batch_at = time.monotonic() + self.rate_limit_delay
+
+                    # Post in queue order
+                    for job, translated in zip(active, translations):
+                        # Skip if no translation is needed (English message, link-only, or other reason)
+                        if translated is None:
+                            logger.debug("Skipping message - no translation needed")
+                            continue
+
+                        logger.debug("Translated message: '%.50s...'", translated)
+
+                        # A failed post only loses its own message, not the rest of the batch
+                        try:
+                            await self._send_translation(job, translated)
+                        except Exception as e:
+                            logger.error("Error posting translation: %s", e)
+
+                except Exception as e:
+                    logger.error("Error in translation queue worker: %s", e)
+                finally:
+                    # Mark jobs as done even if there was an error
+                    for _ in jobs:
+                        queue.task_done()
+        finally:
+            # Workers only exit when stop() cancels them
+            logger.info("Translation queue worker stopped for channel %s", channel_id)
+
+    def _collect_batch(self, queue, first_job):
+        """Take waiting jobs off the queue, up to the batch size and character limits"""
+        jobs = [first_job]
+        total_chars = first_job.length()
+
+        while len(jobs) < BATCH_MAX_MESSAGES and total_chars < BATCH_MAX_CHARS:
+            try:
+                job = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            jobs.append(job)
+            total_chars += job.length()
 
-        print("Translation queue worker stopped")
+            # A job still held for follow-ups can grow, so it ends the batch
+            if not job.ready.is_set():
+                break
 
-    def start(self):
-        """Start the queue worker if not already running"""
-        if not self.worker_running or (
-            self.worker_thread and not self.worker_thread.is_alive()
-        ):
-            self.worker_thread = threading.Thread(
-                target=self._process_queue, daemon=True
+        return jobs
+
+    async def _send_translation(self, job, translated):
+        """Post a translated message as an embed to the guild's target channel"""
+        # Create an embed with user avatar, name, timestamp and translated message
+        embed = discord.Embed(
+            description=translated,
+            color=job.message.author.color,
+            timestamp=job.message.created_at,
+        )
+        embed.set_author(
+            name=job.message.author.display_name,
+            icon_url=job.message.author.display_avatar.url
+            if job.message.author.display_avatar
+            else None,
+        )
+
+        embed.add_field(
+            name="",
+            value=f"[Jump to original message]({job.message.jump_url})",
+            inline=False,
+        )
+
+        # Send to target channel
+        target_channel = self.bot.get_channel(job.guild_cfg["target"])
+        if target_channel:
+            await target_channel.send(embed=embed)
+        else:
+            logger.warning(
+                "Could not find target channel with ID: %s", job.guild_cfg["target"]
             )
-            self.worker_thread.start()
+
+    def _start_channel_worker(self, channel_id):
+        """Start a channel's worker task, unless it's already running"""
+        worker = self._channel_workers.get(channel_id)
+        if worker and not worker.done():
+            return
+        self._channel_workers[channel_id] = self.bot.loop.create_task(
+            self._process_channel(channel_id)
+        )
+
+    def start(self):
+        """Start processing the queues"""
+        self._run_event.set()
 
     def stop(self):
-        """Stop the queue worker"""
-        self.worker_running = False
-        if self.worker_thread:
-            self.worker_thread.join(timeout=2.0)
+        """Stop all queue workers"""
+        self._run_event.clear()
+        for worker in self._channel_workers.values():
+            worker.cancel()
+        self._channel_workers.clear()
 
     def _load_config(self):
         """Load queue settings from config file"""
         try:
-            with open(self.config_file, "r") as f:
-                config = json.load(f)
+            with open(self.config_file, "rb") as f:
+                config = orjson.loads(f.read())
                 return config.get("queueSettings", {})
         except FileNotFoundError:
-            print(f"Config file {self.config_file} not found, using defaults")
+            logger.warning("Config file %s not found, using defaults", self.config_file)
             return {}
-        except json.JSONDecodeError:
-            print(f"Error decoding JSON from {self.config_file}, using defaults")
+        except orjson.JSONDecodeError:
+            logger.error(
+                "Error decoding JSON from %s, using defaults", self.config_file
+            )
             return {}
 
     def _save_config(self):
         """Save queue settings to config file"""
         try:
-            with open(self.config_file, "r") as f:
-                config = json.load(f)
+            with open(self.config_file, "rb") as f:
+                config = orjson.loads(f.read())
         except FileNotFoundError:
             config = {}
-        except json.JSONDecodeError:
-            print(f"Error decoding JSON from {self.config_file}, creating new file")
+        except orjson.JSONDecodeError:
+            logger.error(
+                "Error decoding JSON from %s, creating new file", self.config_file
+            )
             config = {}
 
-        # Update queue settings
-        config["queueSettings"] = {"rateLimitDelay": self.rate_limit_delay}
+        # Update queue settings, keeping any other settings such as autoStart
+        config.setdefault("queueSettings", {})["rateLimitDelay"] = self.rate_limit_delay
 
         try:
-            with open(self.config_file, "w") as f:
-                json.dump(config, f, indent=2)
+            save_json(self.config_file, config)
         except Exception as e:
-            print(f"Error saving config: {e}")
+            logger.error("Error saving config: %s", e)
 
     def set_rate_limit(self, delay):
         """Set the rate limit delay and save to config"""
+        # Only rewrite the file when the delay actually changed
+        if delay == self.rate_limit_delay:
+            return
+
         self.rate_limit_delay = delay
         self._save_config()
 
     def clear_queue(self):
-        """Clear all pending jobs from the queue"""
-        # Empty the queue without processing
-        while not self.translation_queue.empty():
-            try:
-                self.translation_queue.get_nowait()
-                self.translation_queue.task_done()
-            except Empty:
-                break
-        print(f"Cleared {self.translation_queue.qsize()} items from translation queue")
+        """Clear all pending jobs from every channel's queue
+
+        Returns:
+            int: Number of messages that were dropped
+        """
+        dropped = set()
+
+        # Stop waiting for follow-ups; workers skip these jobs if they already took them
+        for timer, job in self._pending.values():
+            timer.cancel()
+            job.cancelled = True
+            job.ready.set()
+            dropped.add(job)
+        self._pending.clear()
+
+        # Drop jobs workers took just before the queue was paused
+        for channel_id, job in self._held_jobs.items():
+            self._channel_queues[channel_id].task_done()
+            dropped.add(job)
+        self._held_jobs.clear()
+
+        # Empty the queues without processing
+        # Everything runs on the event loop, so nothing can be added while draining
+        for queue in self._channel_queues.values():
+            while True:
+                try:
+                    job = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                queue.task_done()
+                dropped.add(job)
+
+        cleared = sum(len(job.messages) for job in dropped)
+        logger.info("Cleared %d items from translation queue", cleared)
+        return cleared
 
     def pause(self):
-        """Pause processing of the queue"""
-        self.worker_running = False
-        print("Translation queue paused")
+        """Pause processing of the queue
+
+        Workers finish their current batch and then wait until resumed
+        """
+        self._run_event.clear()
+        logger.info("Translation queue paused")
 
     def resume(self):
         """Resume processing of the queue"""
-        if not self.worker_running or (
-            self.worker_thread and not self.worker_thread.is_alive()
-        ):
-            self.worker_thread = threading.Thread(
-                target=self._process_queue, daemon=True
-            )
-            self.worker_thread.start()
-        print("Translation queue resumed")
+        self._run_event.set()
+        logger.info("Translation queue resumed")
 
     def get_queue_size(self):
-        """Get the current size of the queue"""
-        return self.translation_queue.qsize()
+        """Get the number of messages waiting across all channel queues"""
+        return len(self._held_jobs) + sum(
+            queue.qsize() for queue in self._channel_queues.values()
+        )
+
+    def estimate_wait_time(self):
+        """
+        Estimate how long until the current queue is translated
+
+        Channels are worked on in parallel and each waits the rate limit delay once
+        per batch, so the busiest channel sets the wait. Batches cut short by
+        BATCH_MAX_CHARS make the real wait longer
+
+        Returns:
+            float: Approximate wait in seconds
+        """
+        busiest = 0
+        for channel_id, queue in self._channel_queues.items():
+            size = queue.qsize() + (1 if channel_id in self._held_jobs else 0)
+            busiest = max(busiest, size)
+
+        batches = -(-busiest // BATCH_MAX_MESSAGES)  # Round up
+        return batches * self.rate_limit_delay
 
     def is_worker_running(self):
-        """Check if the worker thread is currently running"""
-        return self.worker_running and (
-            self.worker_thread and self.worker_thread.is_alive()
-        )
+        """Check if the queue is running (not paused or stopped)"""
+        return self._run_event.is_set()
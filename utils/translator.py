@@ -1,52 +1,155 @@
+import asyncio
+import functools
+import json
+import logging
 import os
 import re
 import time
+from collections import OrderedDict
+from hashlib import blake2b
 
 import openai
 from dotenv import load_dotenv
 from langdetect import detect
 
-# Load environment variables
-load_dotenv()
+from . import local_translator
+from .phrase_dict import COMMON_PHRASES
+
+# Prefer Google's compiled CLD3 model for language detection when installed
+try:
+    import gcld3
+
+    _DETECTOR = gcld3.NNetLanguageIdentifier(min_num_bytes=0, max_num_bytes=1000)
+except ImportError:
+    _DETECTOR = None
+
+# Prefer RE2's linear-time matching for the URL patterns when installed
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Load environment variables, unless the key is already exported
+if not os.getenv("OPENAI_API_KEY"):
+    load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+def _compile_url_re(pattern):
+    """Compile a URL pattern with RE2 if available, falling back to re if RE2 rejects it"""
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except re2.error as e:
+            logger.debug("RE2 can't compile URL pattern, using re: %s", e)
+    return re.compile(pattern)
+
+
+# URL patterns, compiled once at import time
+_URL_PATTERN = r"https?:\/\/[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&\/=]*)"
+_DISCORD_PATTERN = (
+    r"https?:\/\/(?:cdn\.)?discord(?:app)?\.com\/attachments\/\d+\/\d+\/[^ ]+"
+)
+# User, channel and role mentions and custom emoji, which shouldn't be sent for translation
+_MARKUP_PATTERN = r"<(?:@[!&]?\d+|#\d+|a?:\w+:\d+)>"
+# Everything that is swapped for a placeholder before translation
+_MASK_RE = _compile_url_re(f"(?:{_URL_PATTERN}|{_DISCORD_PATTERN}|{_MARKUP_PATTERN})")
+# ^ and $ rather than \A and \Z, which RE2 doesn't support; the text is stripped first
+_LINK_ONLY_RE = _compile_url_re(f"^(?:{_URL_PATTERN}|{_DISCORD_PATTERN})$")
+# Stands in for a link or markup while the surrounding text is translated
+_LINK_PLACEHOLDER_RE = re.compile(r"⟦U(\d+)⟧")
 
 # Get OpenAI API key
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+if not OPENAI_API_KEY:
+    logger.warning("OPENAI_API_KEY not found in environment variables")
 
-# Initialize OpenAI client
-client = None
-if OPENAI_API_KEY:
-    client = openai.OpenAI(api_key=OPENAI_API_KEY)
-else:
-    print("WARNING: OPENAI_API_KEY not found in environment variables")
+# Upper bound on a single OpenAI request so a hung call can't stall the queue
+REQUEST_TIMEOUT = 10.0  # seconds
 
+# Caps concurrent OpenAI requests across all channel workers and fanned-out calls
+MAX_CONCURRENT_REQUESTS = 4
+_API_SEM = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
-def translate(text, target="en"):
-    """
-    Translates text to English using OpenAI's GPT-5 mini
+# Retries for rate limits, 5xx responses, connection errors and timeouts
+# The OpenAI client backs off exponentially with jitter and honours Retry-After
+MAX_RETRIES = 3
+
+# OpenAI client, created on first use so messages that never reach the API don't pay for its setup
+_client = None
 
-    Args:
-        text (str): Text to translate
-        target (str): Target language code (default: "en" for English)
+
+def _get_client():
+    """
+    Get the shared OpenAI client, creating it on first use
 
     Returns:
-        str: Translated text or original text if translation fails
+        openai.AsyncOpenAI | None: The client, or None if OPENAI_API_KEY isn't set
     """
-    start_time = time.time()
-    print(f"TRANSLATE: Starting translation of '{text[:30]}...'")
+    global _client
+    if _client is None and OPENAI_API_KEY:
+        _client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=MAX_RETRIES)
+    return _client
 
-    # Check if text is empty
-    if not text or not text.strip():
-        print("DEBUG: Empty text, returning")
-        return None
 
-    # Skip translation only for English
-    # First check if it's a link to avoid language detection errors
-    if is_link_only(text):
-        print("DEBUG: Text is a link, skipping language detection")
-        return None
+# Polling for Batch API jobs backs off from the first interval up to the max
+BATCH_POLL_INTERVAL = 5.0  # seconds
+BATCH_POLL_MAX_INTERVAL = 60.0  # seconds
+_BATCH_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
 
-    # Check for common English words first (before langdetect)
-    common_english_words = {
+
+def _estimate_tokens(text):
+    """Roughly estimate the token count of text without running a tokenizer"""
+    # Latin-script text averages 3-4 characters per token, other scripts are denser
+    if text.isascii():
+        return len(text) // 3 + 1
+    return len(text) // 2 + 1
+
+
+def _max_completion_tokens(text, limit=1000):
+    """
+    Scale the completion token limit to the input length, capped at limit
+
+    A translation is rarely more than 1.5x the length of its input, so the limit
+    leaves a little headroom over that and stops runaway generations early
+    """
+    return min(limit, max(32, int(_estimate_tokens(text) * 1.6) + 16))
+
+
+# System prompt for translating Portuguese or Swiss German to English
+_SYSTEM_PROMPT = "Translate non-English text to English. For English/slang (jk, gg, lol, etc.), return unchanged. Keep placeholders like ⟦U0⟧ exactly as they are. Only return translation or original text."
+
+
+# LRU cache of translation results keyed by (text, target)
+# A cached value of None means the text was detected as not needing translation
+TRANSLATION_CACHE_SIZE = 4096
+_translation_cache = OrderedDict()
+
+
+# Texts longer than this are keyed by a digest so the cache doesn't hold long messages twice
+CACHE_KEY_MAX_CHARS = 200
+
+
+def _cache_key(text, target):
+    """Build the translation cache key for text"""
+    text = text.strip()
+    if len(text) > CACHE_KEY_MAX_CHARS:
+        text = blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    return (text, target)
+
+
+def _cache_translation(key, value):
+    """Store a translation result, evicting the least recently used entry"""
+    _translation_cache[key] = value
+    _translation_cache.move_to_end(key)
+    if len(_translation_cache) > TRANSLATION_CACHE_SIZE:
+        _translation_cache.popitem(last=False)
+
+
+# Common English words; text made up mostly of these skips language detection
+_COMMON_EN = frozenset(
+    {
         "hello",
         "hi",
         "hey",
@@ -97,7 +200,6 @@ def translate(text, target="en"):
         "has",
         "him",
         "his",
-        "how",
         "its",
         "may",
         "new",
@@ -106,7 +208,6 @@ def translate(text, target="en"):
         "see",
         "two",
         "way",
-        "who",
         "boy",
         "did",
         "didnt",
@@ -117,85 +218,503 @@ def translate(text, target="en"):
         "too",
         "use",
     }
+)
+
+
+def _lookup_phrase(text):
+    """
+    Look up a short common phrase in the static phrase table
+
+    Trailing punctuation and a leading capital are carried over to the translation
+
+    Args:
+        text (str): Text to look up
+
+    Returns:
+        str | None: English translation, or None if the text isn't a known phrase
+    """
+    text = text.strip()
+    phrase = text.rstrip(".!?")
+    translation = COMMON_PHRASES.get(phrase.lower())
+    if translation is None:
+        return None
+
+    if phrase[:1].isupper():
+        translation = translation[:1].upper() + translation[1:]
+    return translation + text[len(phrase) :]
+
+
+# Texts shorter than this are too short to detect and are treated as not needing translation
+DETECT_MIN_CHARS = 4
+
+
+# Recently detected non-English language per (guild_id, author_id), stored as (lang, detected_at)
+# Only used as a hint when a text is too short to detect or detection fails, so a
+# language switch is still picked up by the next detection
+# Kept in insertion order, oldest first, so expired entries are pruned from the front
+USER_LANGUAGE_TTL = 300  # seconds
+USER_LANGUAGE_CACHE_SIZE = 4096
+_user_language_cache = {}
+
+
+def _get_user_language(user_key):
+    """Get the cached language for an author, or None if unknown or expired"""
+    entry = _user_language_cache.get(user_key)
+    if entry is None:
+        return None
+
+    lang, detected_at = entry
+    if time.monotonic() - detected_at > USER_LANGUAGE_TTL:
+        del _user_language_cache[user_key]
+        return None
+    return lang
+
+
+def _set_user_language(user_key, lang):
+    """Remember the language an author is writing in, dropping expired and excess entries"""
+    now = time.monotonic()
+    _user_language_cache.pop(user_key, None)
+    _user_language_cache[user_key] = (lang, now)
+
+    while True:
+        oldest = next(iter(_user_language_cache))
+        _, detected_at = _user_language_cache[oldest]
+        if (
+            now - detected_at <= USER_LANGUAGE_TTL
+            and len(_user_language_cache) <= USER_LANGUAGE_CACHE_SIZE
+        ):
+            break
+        del _user_language_cache[oldest]
+
+
+# Texts up to this length go to the local model (when configured) instead of the API
+LOCAL_MAX_CHARS = 40
+
+
+async def _translate_locally(text, source_lang):
+    """
+    Translates short text with the local model if it supports the source language
+
+    Args:
+        text (str): Text to translate
+        source_lang (str): Detected language code
+
+    Returns:
+        str | None: Translated text, or None if the local model wasn't used
+    """
+    # Link placeholders are left to the API, which is told to keep them intact
+    if (
+        len(text) > LOCAL_MAX_CHARS
+        or "⟦U" in text
+        or not local_translator.supports(source_lang)
+    ):
+        return None
+
+    try:
+        # The model is CPU-bound, so keep it off the event loop
+        translated_text = await asyncio.to_thread(
+            local_translator.translate, text, source_lang
+        )
+    except Exception as e:
+        logger.error("Local translation error: %s", e)
+        return None
+
+    logger.debug("Translated locally from %s: '%.50s...'", source_lang, translated_text)
+    return translated_text or None
+
+
+def _detect(text):
+    """Run the language detector on text"""
+    if _DETECTOR is not None:
+        return _DETECTOR.FindLanguage(text=text).language
+    return detect(text)
+
+
+# Only short texts are memoized, so the cache can't hold thousands of long messages
+_detect_cached = functools.lru_cache(maxsize=8192)(_detect)
+
+
+def detect_language(text):
+    """
+    Detects the language of text using CLD3 if available, otherwise langdetect
+
+    Results for texts up to CACHE_KEY_MAX_CHARS are memoized, so repeated texts are
+    only inspected once. Longer texts are rarely repeated and are answered from the
+    translation cache when they are
+
+    Args:
+        text (str): Text to inspect
+
+    Returns:
+        str: Language code such as "en" or "pt"
+    """
+    if len(text) > CACHE_KEY_MAX_CHARS:
+        return _detect(text)
+    return _detect_cached(text)
+
+
+def cache_info():
+    """
+    Report the size of the in-process caches, for debugging
+
+    Returns:
+        dict: Entry counts for the translation and author language caches, and
+            hit/miss statistics for language detection
+    """
+    return {
+        "translations": len(_translation_cache),
+        "translations_max": TRANSLATION_CACHE_SIZE,
+        "user_languages": len(_user_language_cache),
+        "detection": _detect_cached.cache_info()._asdict(),
+    }
+
+
+async def _detect_source_language(text, cache_key, user_key=None):
+    """
+    Runs the local checks that decide whether text is English, and if not, which language it is
+
+    English results are stored in the translation cache under cache_key
+
+    Args:
+        text (str): Text to check
+        cache_key (tuple): Translation cache key for the text
+        user_key (tuple, optional): (guild_id, author_id) of the text's author
+
+    Returns:
+        tuple: (language, from_hint) where language is the detected language code
+            ("und" if unknown) or None if the text is English and should be skipped,
+            and from_hint is True if the language came from the author's recent
+            messages rather than the text itself
+    """
+    # Link and markup placeholders aren't words, and their "⟦" would make the text non-ASCII
+    text = _LINK_PLACEHOLDER_RE.sub(" ", text)
 
+    # Check for common English words first (before langdetect)
     text_clean = text.lower().strip()
     words = text_clean.split()
 
+    # Ignore surrounding punctuation on plain ASCII text so "thanks!" counts as English
+    if text_clean.isascii():
+        words = [word.strip(".,!?'\"-") for word in words]
+
     # Check if most words are common English words (for all message lengths)
-    if words:
-        english_word_ratio = sum(
-            1 for word in words if word in common_english_words
-        ) / len(words)
-        if english_word_ratio > 0.6:
-            print("DEBUG: Text with mostly common English words, returning None")
-            return None
+    # Stops scanning as soon as more than 60% of the words are known to be English
+    needed = len(words) * 3 // 5 + 1
+    hits = 0
+    for word in words:
+        if word in _COMMON_EN:
+            hits += 1
+            if hits >= needed:
+                logger.debug("Text with mostly common English words, skipping")
+                _cache_translation(cache_key, None)
+                return None, False
+
+    # The author's recent non-English language, used when detection can't decide
+    user_lang = _get_user_language(user_key) if user_key else None
+
+    # Detection is unreliable on a few characters, which are mostly "ok", "gg" or emoji
+    if len(text_clean) < DETECT_MIN_CHARS:
+        if user_lang:
+            logger.debug(
+                "Text too short for language detection, author recently wrote %s",
+                user_lang,
+            )
+            return user_lang, True
+        logger.debug("Text too short for language detection, skipping")
+        return None, False
 
     # Use langdetect to determine if text needs translation (only if common words check didn't catch it)
     try:
-        detected_lang = detect(text)
+        # Detection is CPU-bound, so keep it off the event loop
+        detected_lang = await asyncio.to_thread(detect_language, text)
         if detected_lang in ["en"]:
-            print(
-                f"DEBUG: Text is detected as English ({detected_lang}), returning None"
-            )
-            return None
-        else:
-            print(
-                f"DEBUG: Text is detected as {detected_lang}, proceeding with translation"
-            )
+            logger.debug("Text is detected as English (%s), skipping", detected_lang)
+            _cache_translation(cache_key, None)
+            return None, False
+        logger.debug(
+            "Text is detected as %s, proceeding with translation",
+            detected_lang,
+        )
     except Exception as e:
-        print(f"DEBUG: Language detection error: {e}, proceeding with translation")
+        logger.debug("Language detection error: %s, proceeding with translation", e)
         # If language detection fails, proceed with translation
+        return (user_lang, True) if user_lang else ("und", False)
+
+    if user_key and detected_lang != "und":
+        _set_user_language(user_key, detected_lang)
+    return detected_lang, False
+
+
+async def _resolve_locally(text, target="en", guild_id=None, author_id=None):
+    """
+    Runs every check that can settle a translation without the OpenAI API
+
+    In order: empty and link-only text, the translation cache, the phrase table,
+    English and language detection, then the local model for short texts
+
+    Args:
+        text (str): Text to translate
+        target (str): Target language code (default: "en")
+        guild_id (int, optional): Guild the text was sent in
+        author_id (int, optional): Author of the text
 
-    print("DEBUG: Translating text (assumed to be Swiss German dialect)")
+    Returns:
+        tuple: (resolved, result). If resolved is True, result is the translation, or
+            None if the text doesn't need translating. Otherwise the text needs the
+            API and result is whether its translation may be cached, which it may not
+            when the source language was taken from the author's recent messages
+    """
+    # Check if text is empty
+    if not text or not text.strip():
+        logger.debug("Empty text, returning")
+        return True, None
+
+    # Skip translation only for English
+    # First check if it's a link to avoid language detection errors
+    if is_link_only(text):
+        logger.debug("Text is a link, skipping language detection")
+        return True, None
+
+    # Repeated messages are answered from the cache without detection or API calls
+    cache_key = _cache_key(text, target)
+    if cache_key in _translation_cache:
+        _translation_cache.move_to_end(cache_key)
+        logger.debug("Translation cache hit")
+        return True, _translation_cache[cache_key]
+
+    # Short common phrases are translated from a static table without an API call
+    phrase_translation = _lookup_phrase(text)
+    if phrase_translation is not None:
+        logger.debug("Common phrase, using phrase table")
+        return True, phrase_translation
+
+    user_key = None
+    if guild_id is not None and author_id is not None:
+        user_key = (guild_id, author_id)
+
+    source_lang, from_hint = await _detect_source_language(text, cache_key, user_key)
+    if source_lang is None:
+        return True, None
+
+    # The cache is shared by all authors, so a translation that relied on this
+    # author's language hint is not stored in it
+    cacheable = not from_hint
+
+    # Short texts are translated by the local model when one is configured
+    translated_text = await _translate_locally(text, source_lang)
+    if translated_text is not None:
+        if cacheable:
+            _cache_translation(cache_key, translated_text)
+        return True, translated_text
+
+    return False, cacheable
+
+
+async def translate(text, target="en", guild_id=None, author_id=None):
+    """
+    Translates text to English using OpenAI's GPT-5 mini
+
+    Args:
+        text (str): Text to translate
+        target (str): Target language code (default: "en" for English)
+        guild_id (int, optional): Guild the text was sent in
+        author_id (int, optional): Author of the text, used with guild_id to reuse
+            the author's recently detected language
+
+    Returns:
+        str: Translated text or original text if translation fails
+    """
+    logger.debug("Starting translation of '%.30s...'", text)
+
+    resolved, result = await _resolve_locally(text, target, guild_id, author_id)
+    if resolved:
+        return result
+
+    return await _request_translation(text, target, cache=result)
+
+
+def _completion_body(text):
+    """
+    Build the chat completion request for translating text
+
+    Args:
+        text (str): Text to translate
+
+    Returns:
+        dict: Request parameters, shared by the realtime, streaming and Batch API calls
+    """
+    return {
+        "model": "gpt-5-mini",
+        "messages": [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": text},
+        ],
+        "max_completion_tokens": _max_completion_tokens(text),
+        # Keep reasoning short so the scaled limit is left for the translation
+        "reasoning_effort": "minimal",
+    }
+
+
+async def _request_translation(text, target="en", cache=True):
+    """
+    Translates text with the OpenAI API, without the local checks
+
+    Only for text that _resolve_locally() has already found needs the API
+
+    Args:
+        text (str): Text to translate
+        target (str): Target language code (default: "en")
+        cache (bool): Whether to store the translation in the cache (default: True)
+
+    Returns:
+        str: Translated text or original text if translation fails
+    """
+    start_time = time.time()
+    cache_key = _cache_key(text, target)
+    logger.debug("Translating text (assumed to be Swiss German dialect)")
 
     if not OPENAI_API_KEY:
-        print("DEBUG: OpenAI API key not available, returning original text")
+        logger.debug("OpenAI API key not available, returning original text")
         return text
 
     if target != "en":
-        print(f"DEBUG: Unsupported target language: {target}, defaulting to English")
+        logger.debug("Unsupported target language: %s, defaulting to English", target)
         target = "en"
 
     try:
-        # Create a system prompt for translating Portuguese or Swiss German to English
-        system_prompt = "Translate non-English text to English. For English/slang (jk, gg, lol, etc.), return unchanged. Only return translation or original text."
-        print(f"DEBUG: System prompt: {system_prompt}")
+        logger.debug("System prompt: %s", _SYSTEM_PROMPT)
 
         # Call OpenAI API
+        client = _get_client()
         if not client:
-            print("DEBUG: OpenAI client not initialized")
+            logger.debug("OpenAI client not initialized")
             return text
 
-        print("DEBUG: Calling OpenAI API...")
-        response = client.chat.completions.create(
-            model="gpt-5-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": text},
-            ],
-            max_completion_tokens=1000,  # Adjust based on expected message length
-        )
+        logger.debug("Calling OpenAI API...")
+        async with _API_SEM:
+            response = await client.chat.completions.create(
+                **_completion_body(text), timeout=REQUEST_TIMEOUT
+            )
+
+        # A cut-off translation is worse than the original, so don't post or cache it
+        if (
+            response
+            and response.choices
+            and response.choices[0].finish_reason == "length"
+        ):
+            logger.warning(
+                "Translation hit the completion token limit, returning original text"
+            )
+            return text
 
         # Extract and return the translated text
         if response and response.choices and response.choices[0].message.content:
             translated_text = response.choices[0].message.content.strip()
             elapsed_time = time.time() - start_time
-            print(
-                f"TRANSLATE: Completed in {elapsed_time:.2f}s - '{translated_text[:50]}...'"
+            logger.debug(
+                "Translation completed in %.2fs - '%.50s...'",
+                elapsed_time,
+                translated_text,
             )
+            if cache:
+                _cache_translation(cache_key, translated_text)
             return translated_text
         else:
-            print("DEBUG: No choices in response")
+            logger.debug("No choices in response")
             return text
 
+    except openai.RateLimitError:
+        logger.warning(
+            "Still rate limited after %d retries, returning original text", MAX_RETRIES
+        )
+        return text
+    except openai.APITimeoutError:
+        logger.warning(
+            "Translation timed out after %.0fs, returning original text",
+            REQUEST_TIMEOUT,
+        )
+        return text
     except Exception as e:
-        print(f"DEBUG: Translation error: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Translation error: %s", e)
         return text  # Return original text if translation fails
 
 
+# A streamed translation is cut off once it grows this many times longer than the input
+STREAM_MAX_LENGTH_RATIO = 3
+
+
+async def translate_stream(text, target="en", guild_id=None, author_id=None):
+    """
+    Translate text to English, yielding the translation as the model generates it
+
+    Each yielded value is the whole translation so far, so it can be passed straight to
+    message.edit(). Nothing is yielded if the text doesn't need translating, and the
+    stream is stopped early if the output runs far past the length of the input
+
+    Args:
+        text (str): Text to translate
+        target (str): Target language code (default: "en")
+        guild_id (int, optional): Guild the text was sent in
+        author_id (int, optional): Author of the text
+
+    Yields:
+        str: Translated text so far
+    """
+    resolved, result = await _resolve_locally(text, target, guild_id, author_id)
+    if resolved:
+        if result is not None:
+            yield result
+        return
+
+    cache_key = _cache_key(text, target)
+    client = _get_client()
+    if not client:
+        logger.debug("OpenAI client not initialized")
+        return
+
+    max_chars = STREAM_MAX_LENGTH_RATIO * len(text) + 100
+    parts = []
+    length = 0
+    try:
+        async with _API_SEM:
+            stream = await client.chat.completions.create(
+                **_completion_body(text), timeout=REQUEST_TIMEOUT, stream=True
+            )
+
+        # Read outside the semaphore so a slow consumer can't hold on to a slot
+        finish_reason = None
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+
+            length += len(delta)
+            if length > max_chars:
+                logger.warning(
+                    "Streamed translation passed %d characters, stopping", max_chars
+                )
+                await stream.close()
+                return
+
+            parts.append(delta)
+            yield "".join(parts)
+    except Exception as e:
+        logger.error("Streaming translation error: %s", e)
+        return
+
+    # Already yielded, but a cut-off translation mustn't be served from the cache
+    if finish_reason == "length":
+        logger.warning("Streamed translation hit the completion token limit")
+        return
+
+    translated_text = "".join(parts).strip()
+    if translated_text and result:
+        _cache_translation(cache_key, translated_text)
+
+
 def is_link_only(text):
     """
     Check if message contains only a link
@@ -206,103 +725,362 @@ def is_link_only(text):
     Returns:
         bool: True if message contains only a link
     """
-    print(f"DEBUG: is_link_only() called with: '{text[:30]}...'")
-    # Remove common whitespace
+    logger.debug("is_link_only() called with: '%.30s...'", text)
     text = text.strip()
 
-    # Common URL patterns
-    url_pattern = re.compile(
-        r"^https?:\/\/[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&\/=]*)$"
-    )
+    # A single link starts with the scheme and has no whitespace, which rules out
+    # almost every chat message without running the regex
+    if not text.startswith(("http://", "https://")) or any(c.isspace() for c in text):
+        logger.debug("is_link_only() result: False")
+        return False
 
-    # Discord attachment pattern
-    discord_attachment_pattern = re.compile(
-        r"^https?:\/\/(?:cdn\.)?discord(?:app)?\.com\/attachments\/\d+\/\d+\/[^ ]+$"
-    )
+    result = _LINK_ONLY_RE.match(text) is not None
+    logger.debug("is_link_only() result: %s", result)
+    return result
+
+
+def _restore_links(text, links):
+    """
+    Put links, mentions and emoji back in place of their placeholders
+
+    Links whose placeholder was dropped from the text are appended at the end
+
+    Args:
+        text (str): Text containing ⟦U<n>⟧ placeholders
+        links (list[str]): Original links and markup, indexed by placeholder number
+
+    Returns:
+        str: Text with the original links and markup restored
+    """
+    restored = set()
+
+    def _restore(match):
+        index = int(match.group(1))
+        if index >= len(links):
+            return match.group(0)
+        restored.add(index)
+        return links[index]
+
+    result = _LINK_PLACEHOLDER_RE.sub(_restore, text)
+
+    missing = [link for i, link in enumerate(links) if i not in restored]
+    if missing:
+        logger.debug("Translation dropped %d link placeholders", len(missing))
+        result = " ".join([result, *missing])
 
-    result = bool(url_pattern.match(text) or discord_attachment_pattern.match(text))
-    print(f"DEBUG: is_link_only() result: {result}")
     return result
 
 
-def translate_message_with_links(text, target="en"):
+async def translate_message_with_links(
+    text, target="en", guild_id=None, author_id=None, mode="realtime"
+):
     """
     Translate a message that may contain links
 
     If message contains only a link, returns None (message is skipped)
-    If message contains text with links, translates only the text parts
+    If message contains text with links, the links are swapped for placeholders so the
+    whole message is translated in one call, then the original links are put back
+    Mentions and custom emoji are swapped for placeholders the same way
     If message is in English, returns None (message is skipped)
 
     Args:
         text (str): Message text that may contain links
         target (str): Target language code (default: "en")
+        guild_id (int, optional): Guild the message was sent in
+        author_id (int, optional): Author of the message
+        mode (str): "realtime" to call the API directly, or "batch" to go through the
+            cheaper but slower Batch API for non-interactive work
 
     Returns:
         str | None: Translated message with original links preserved, or None if no translation needed
     """
-    print(f"DEBUG: translate_message_with_links() called with: '{text[:50]}...'")
+    logger.debug("translate_message_with_links() called with: '%.50s...'", text)
 
-    # If it's just a link, skip entirely
-    if is_link_only(text):
-        print("DEBUG: Message is link only, skipping")
+    if mode not in ("realtime", "batch"):
+        raise ValueError(f"Unknown translation mode: {mode}")
+
+    links = []
+
+    # Most chat messages have no links or markup, so skip the regexes unless they can match
+    if "http" in text or "<" in text:
+        # If it's just a link, skip entirely
+        if is_link_only(text):
+            logger.debug("Message is link only, skipping")
+            return None
+
+        # Replace links, mentions and emoji with numbered placeholders so they pass
+        # through translation untouched and don't cost output tokens
+        def _mask_link(match):
+            links.append(match.group(0))
+            return f"⟦U{len(links) - 1}⟧"
+
+        masked = _MASK_RE.sub(_mask_link, text)
+        logger.debug("Found %d links and markup in message", len(links))
+
+    # If no links were found, just translate the whole message
+    if not links:
+        logger.debug("No links found, translating entire message")
+        if mode == "batch":
+            (translated,) = await translate_batch([text], target)
+            return translated
+        return await translate(
+            text, target, guild_id, author_id
+        )  # translate already returns None for English text
+
+    # Links, mentions or emoji with nothing else around them don't need translating
+    if not _LINK_PLACEHOLDER_RE.sub("", masked).strip():
+        logger.debug("Message only contains links and markup, skipping")
+        return None
+
+    if mode == "batch":
+        (translated,) = await translate_batch([masked], target)
+    else:
+        translated = await translate(masked, target, guild_id, author_id)
+
+    # If translation returns None (English text), skip the whole message
+    if translated is None:
+        logger.debug("No translatable content, returning None")
         return None
 
-    # Pattern to find URLs in the text
-    url_pattern = re.compile(
-        r"(https?:\/\/[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&\/=]*)|https?:\/\/(?:cdn\.)?discord(?:app)?\.com\/attachments\/\d+\/\d+\/[^ ]+)"
+    result = _restore_links(translated, links)
+    logger.debug("Final result: '%.50s...'", result)
+    return result
+
+
+async def translate_messages(messages, target="en"):
+    """
+    Translate several messages with a single OpenAI call
+
+    Messages containing links or markup are translated individually with
+    translate_message_with_links(), concurrently with the batched call. If the
+    batched response can't be parsed, those messages fall back to concurrent
+    translate() calls.
+
+    Args:
+        messages (list[tuple]): (text, guild_id, author_id) for each message
+        target (str): Target language code (default: "en")
+
+    Returns:
+        list[str | None]: Translation for each message, None where no translation is needed
+    """
+    results = [None] * len(messages)
+    with_links = []  # Indexes of messages containing links or markup
+    pending = []  # Indexes of messages that still need the API
+    cacheable = {}  # Whether each pending message's translation may be cached
+
+    for i, (text, guild_id, author_id) in enumerate(messages):
+        if not text or not text.strip() or is_link_only(text):
+            continue
+
+        if ("http" in text or "<" in text) and _MASK_RE.search(text):
+            with_links.append(i)
+            continue
+
+        resolved, result = await _resolve_locally(text, target, guild_id, author_id)
+        if resolved:
+            results[i] = result
+            continue
+
+        pending.append(i)
+        cacheable[i] = result
+
+    # Messages with links and the batch are independent requests, so run them together
+    requests = [
+        translate_message_with_links(text, target, guild_id, author_id)
+        for text, guild_id, author_id in (messages[i] for i in with_links)
+    ]
+    use_batch = len(pending) > 1 and _get_client() is not None
+    if use_batch:
+        requests.append(_request_batch_translation([messages[i][0] for i in pending]))
+
+    responses = await asyncio.gather(*requests)
+    for i, translated_text in zip(with_links, responses):
+        results[i] = translated_text
+
+    translations = responses[-1] if use_batch else None
+    if translations is not None:
+        for i, translated_text in zip(pending, translations):
+            if cacheable[i]:
+                _cache_translation(_cache_key(messages[i][0], target), translated_text)
+            results[i] = translated_text
+        return results
+
+    # Single message, or the batch failed: translate each one concurrently
+    # These already went through the local checks, so go straight to the API
+    translations = await asyncio.gather(
+        *(
+            _request_translation(messages[i][0], target, cache=cacheable[i])
+            for i in pending
+        )
     )
+    for i, translated_text in zip(pending, translations):
+        results[i] = translated_text
+
+    return results
 
-    # Split the text into parts (links and non-links)
-    parts = []
-    last_end = 0
 
-    for match in url_pattern.finditer(text):
-        # Add the text before the link
-        if last_end < match.start():
-            parts.append(("text", text[last_end : match.start()]))
+async def _request_batch_translation(texts):
+    """
+    Translate a list of texts in one OpenAI call that returns a JSON array
 
-        # Add the link
-        parts.append(("link", match.group(0)))
-        last_end = match.end()
+    Args:
+        texts (list[str]): Texts to translate
 
-    # Add any remaining text after the last link
-    if last_end < len(text):
-        parts.append(("text", text[last_end:]))
+    Returns:
+        list[str] | None: Translations in the same order, or None if the call failed
+    """
+    system_prompt = "Translate each string in the JSON array from non-English to English. For English/slang (jk, gg, lol, etc.), return the string unchanged. Return only a JSON array of strings with the same length and order."
 
-    print(f"DEBUG: Found {len(parts)} parts in message")
-    for i, (part_type, content) in enumerate(parts):
-        print(f"DEBUG: Part {i}: type={part_type}, content='{content[:30]}...'")
+    payload = json.dumps(texts, ensure_ascii=False)
 
-    # If no links were found, just translate the whole message
-    if not parts:
-        print("DEBUG: No links found, translating entire message")
-        return translate(
-            text, target
-        )  # translate already returns None for English text
+    logger.debug("Calling OpenAI API for a batch of %d messages...", len(texts))
+    try:
+        async with _API_SEM:
+            response = await _get_client().chat.completions.create(
+                model="gpt-5-mini",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": payload},
+                ],
+                max_completion_tokens=_max_completion_tokens(payload, limit=2000),
+                reasoning_effort="minimal",
+                timeout=REQUEST_TIMEOUT,
+            )
+        content = response.choices[0].message.content if response.choices else None
+        translations = json.loads(content) if content else None
+    except Exception as e:
+        logger.error("Batched translation error: %s", e)
+        return None
 
-    # Translate text parts and keep links as-is
-    result_parts = []
-    for part_type, content in parts:
-        if part_type == "text":
-            # Only translate if there's actual text content (not just whitespace)
-            if content.strip():
-                print(f"DEBUG: Translating text part: '{content[:30]}...'")
-                translated = translate(content, target)
-                # If translation returns None (English text), don't include this part
-                if translated is not None:
-                    result_parts.append(translated)
-                # If no parts will be added (all English text), we'll return None at the end
-            else:
-                print("DEBUG: Skipping empty text part")
-        else:  # link
-            print("DEBUG: Keeping link part as-is")
-            result_parts.append(content)
-
-    # If we have no result parts (all text was English), return None
-    if not result_parts:
-        print("DEBUG: No translatable content, returning None")
+    if (
+        not isinstance(translations, list)
+        or len(translations) != len(texts)
+        or not all(isinstance(t, str) for t in translations)
+    ):
+        logger.warning("Batched translation returned an unexpected shape")
         return None
 
-    result = "".join(result_parts)
-    print(f"DEBUG: Final result: '{result[:50]}...'")
-    return result
+    return [t.strip() for t in translations]
+
+
+async def translate_batch(texts, target="en"):
+    """
+    Translate texts through the OpenAI Batch API
+
+    Batch jobs cost half as much and use a separate rate limit, but can take up to
+    24 hours, so this is only meant for work nobody is waiting on. Texts are run
+    through the same local checks as translate() first, so only texts that need the
+    API go into the job
+
+    Args:
+        texts (list[str]): Texts to translate
+        target (str): Target language code (default: "en")
+
+    Returns:
+        list[str | None]: Translation for each text, None where no translation is
+            needed, or the original text where translation failed
+    """
+    results = [None] * len(texts)
+    pending = {}  # custom_id -> index into texts
+    lines = []
+    for i, text in enumerate(texts):
+        resolved, result = await _resolve_locally(text, target)
+        if resolved:
+            results[i] = result
+            continue
+
+        # Returned as is if the batch fails
+        results[i] = text
+
+        custom_id = f"t{i}"
+        pending[custom_id] = i
+        lines.append(
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": _completion_body(text),
+                },
+                ensure_ascii=False,
+            )
+        )
+
+    if not lines:
+        return results
+
+    client = _get_client()
+    if not client:
+        logger.debug("OpenAI client not initialized")
+        return results
+
+    try:
+        input_file = await client.files.create(
+            file=("translations.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info("Submitted batch %s with %d texts", batch.id, len(lines))
+
+        delay = BATCH_POLL_INTERVAL
+        while batch.status not in _BATCH_FINAL_STATUSES:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX_INTERVAL)
+            batch = await client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error("Batch %s ended with status %s", batch.id, batch.status)
+            return results
+
+        output = await client.files.content(batch.output_file_id)
+    except Exception as e:
+        logger.error("Batch translation error: %s", e)
+        return results
+
+    translated = 0
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+
+        # A bad line only loses its own text, not the rest of the batch
+        try:
+            entry = json.loads(line)
+            i = pending[entry["custom_id"]]
+            response = entry["response"]
+            if response["status_code"] != 200:
+                logger.warning(
+                    "Batch request %s failed with status %s",
+                    entry["custom_id"],
+                    response["status_code"],
+                )
+                continue
+            choice = response["body"]["choices"][0]
+            if choice.get("finish_reason") == "length":
+                logger.warning(
+                    "Batch request %s hit the completion token limit",
+                    entry["custom_id"],
+                )
+                continue
+            content = choice["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            logger.warning("Skipping unreadable batch output line: %s", e)
+            continue
+
+        if content:
+            results[i] = content.strip()
+            _cache_translation(_cache_key(texts[i], target), results[i])
+            translated += 1
+
+    if translated < len(pending):
+        logger.warning(
+            "Batch %s translated %d of %d texts, returning the rest unchanged",
+            batch.id,
+            translated,
+            len(pending),
+        )
+
+    return results